@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import yaml
+
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Project root: 3 levels up (academic_intelligence_ai -> src -> root)
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+CONFIG_PATH = PROJECT_ROOT / "config" / "config.yaml"
+
+# resolved path -> (st_mtime_ns, st_size, st_ino, parsed config)
+_yaml_cache: dict[Path, tuple[int, int, int, dict]] = {}
+_yaml_cache_lock = threading.Lock()
+
+
+def load_config(config_path: Path = CONFIG_PATH) -> dict:
+    """Load configuration from config/config.yaml.
+
+    The parsed config is cached per file and only re-read when the file's
+    (mtime, size, inode) signature changes, so repeated calls cost a single
+    stat(). The returned dict is shared between callers — treat it as read-only.
+    """
+    path = config_path.resolve()
+    st = path.stat()
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(path)
+        if cached is not None and cached[:3] == signature:
+            return cached[3]
+
+        config = _read_config(path, signature)
+        _yaml_cache[path] = (*signature, config)
+        return config
+
+
+def _read_config(path: Path, signature: tuple[int, int, int]) -> dict:
+    """Parse the YAML config, going through a JSON sidecar when it is up to date.
+
+    The sidecar (config.json next to config.yaml) records the (mtime, size,
+    inode) signature of the YAML it was built from and is only used on an
+    exact match, so a config restored with an older mtime is still picked up.
+    """
+    json_path = path.with_suffix(".json")
+    try:
+        sidecar = json.loads(json_path.read_bytes())
+        if sidecar.get("yaml_signature") == list(signature):
+            return sidecar["config"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    with open(path, "rb") as f:
+        config = yaml.load(f, Loader=_YamlLoader) or {}
+
+    _write_json_sidecar(json_path, signature, config)
+    return config
+
+
+def _write_json_sidecar(json_path: Path, signature: tuple[int, int, int], config: dict):
+    """Atomically write the JSON sidecar; failures only cost the fast path."""
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=json_path.parent, prefix=".config-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"yaml_signature": list(signature), "config": config}, f, ensure_ascii=False)
+            # mkstemp creates the file as 0600; make it readable like config.yaml
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, json_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
@@ -0,0 +1,20 @@
+import sqlite3
+from pathlib import Path
+
+# WAL journal with per-checkpoint fsync, temp tables in RAM, 128 MiB page
+# cache and 256 MiB mmap. The pipeline DB is rebuilt on every full reload,
+# so trading some durability for write speed is acceptable.
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-131072;
+    PRAGMA mmap_size=268435456;
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open a SQLite connection tuned for the pipeline's bulk writes."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(_PRAGMAS)
+    return conn
@@ -1,4 +1,6 @@
-import requests
+import codecs
+
+import aiohttp
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -9,20 +11,51 @@ logger = get_logger("ingest.fetch_html")
 # Project root: 4 levels up from this file (ingest -> academic_intelligence_ai -> src -> root)
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+
+async def fetch_html_async(session: aiohttp.ClientSession, url: str) -> bytes:
+    """Fetch raw HTML bytes from a URL on the running event loop.
+
+    The parser only sees a BOM or <meta charset>, so a non-UTF-8 charset from
+    the Content-Type header is applied here: the body is transcoded to UTF-8
+    and prefixed with a UTF-8 BOM.
+    """
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        response.raise_for_status()
+        html = await response.read()
+        charset = response.charset
+
+    # A BOM in the body already overrides the header charset
+    if not charset or html.startswith(_BOMS):
+        return html
+    try:
+        if codecs.lookup(charset).name == "utf-8":
+            return html
+    except LookupError:
+        logger.warning("Unknown charset %r for %s, saving bytes as served", charset, url)
+        return html
+    return codecs.BOM_UTF8 + html.decode(charset, errors="replace").encode("utf-8")
 
-def fetch_html(url: str) -> str:
-    """Fetch raw HTML content from a URL."""
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    return response.text
 
+def save_raw_html(html: bytes, source_name: str) -> Path:
+    """Save raw HTML bytes to data/raw/, overwriting the previous version for this source.
 
-def save_raw_html(html: str, source_name: str) -> Path:
-    """Save raw HTML to data/raw/, overwriting the previous version for this source."""
+    Identical content is left untouched so its mtime still tells the
+    transform and chunk steps that nothing changed.
+    """
     raw_dir = PROJECT_ROOT / "data" / "raw"
     raw_dir.mkdir(parents=True, exist_ok=True)
 
     file_path = raw_dir / f"{source_name}.html"
-    file_path.write_text(html, encoding="utf-8")
+    try:
+        unchanged = file_path.stat().st_size == len(html) and file_path.read_bytes() == html
+    except FileNotFoundError:
+        unchanged = False
+
+    if unchanged:
+        logger.debug("Unchanged %s, keeping existing file", file_path)
+    else:
+        file_path.write_bytes(html)
 
     return file_path
@@ -1,21 +1,34 @@
-import yaml
+import asyncio
 from pathlib import Path
 
-from academic_intelligence_ai.ingest.fetch_html import fetch_html, save_raw_html
+import aiohttp
+
+from academic_intelligence_ai.config import load_config
+from academic_intelligence_ai.ingest.fetch_html import fetch_html_async, save_raw_html
 from academic_intelligence_ai.monitoring.logger import get_logger
 from academic_intelligence_ai.monitoring.pipeline_tracker import PipelineTracker
 
 logger = get_logger("ingest.run_extract")
 
-# Project root: 4 levels up from this file (ingest -> academic_intelligence_ai -> src -> root)
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
+async def _extract_source(session: aiohttp.ClientSession, src: dict) -> tuple[Path, int]:
+    """Fetch and save a single source; the disk write is offloaded to a thread."""
+    logger.info("Extracting source: %s (%s)", src["name"], src["url"])
+    html = await fetch_html_async(session, src["url"])
+    path = await asyncio.to_thread(save_raw_html, html, src["name"])
+    return path, len(html)
+
+
+async def _extract_all(sources: list[dict]) -> list:
+    """Extract all sources concurrently over one HTTP session.
 
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    Returns one (path, size) tuple or exception per source, in input order.
+    """
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(
+            *(_extract_source(session, src) for src in sources),
+            return_exceptions=True,
+        )
 
 
 def run():
@@ -30,19 +43,16 @@ def run():
         success_count = 0
         fail_count = 0
 
-        for src in enabled:
-            name = src["name"]
-            url = src["url"]
+        results = asyncio.run(_extract_all(enabled)) if enabled else []
 
-            logger.info("Extracting source: %s (%s)", name, url)
-            try:
-                html = fetch_html(url)
-                path = save_raw_html(html, name)
-                logger.info("Saved %s (%d bytes)", path, len(html))
-                success_count += 1
-            except Exception as e:
-                logger.error("Failed %s: %s", name, e)
+        for src, result in zip(enabled, results):
+            if isinstance(result, BaseException):
+                logger.error("Failed %s: %s", src["name"], result)
                 fail_count += 1
+            else:
+                path, size = result
+                logger.info("Saved %s (%d bytes)", path, size)
+                success_count += 1
 
         logger.info("Extraction complete: %d succeeded, %d failed", success_count, fail_count)
         tracker.add_metric("fetch_failures", fail_count)
@@ -0,0 +1,34 @@
+import orjson
+
+# Kept free of heavy imports (torch, faiss, sentence-transformers): worker
+# processes import this module to unpickle parse_chunked_file.
+
+
+def parse_chunked_file(path: str) -> tuple[tuple, list[tuple]]:
+    """Parse one chunked JSON file into plain tuples.
+
+    Runs in a worker process, so it takes and returns only picklable primitives.
+
+    Returns (document, chunks) where document is
+    (source, purpose, raw_filename, full_text_length, processed_at) and each
+    chunk is (chunk_index, text, chunk_length, char_offset).
+    """
+    with open(path, "rb") as f:
+        payload = orjson.loads(f.read())
+
+    document = (
+        payload["source"],
+        payload.get("purpose", "unknown"),
+        payload["raw_filename"],
+        payload["full_text_length"],
+        payload["processed_at"],
+    )
+    # Files written with chunking.store_text=false keep the full text once and
+    # only offsets per chunk
+    full_text = payload.get("text")
+    chunks = []
+    for c in payload["chunks"]:
+        offset, length = c["char_offset"], c["chunk_length"]
+        text = c["text"] if "text" in c else full_text[offset:offset + length]
+        chunks.append((c["chunk_index"], text, length, offset))
+    return document, chunks
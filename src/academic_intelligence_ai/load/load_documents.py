@@ -1,13 +1,17 @@
-import json
+import math
 import pickle
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import faiss
 import numpy as np
-import yaml
+import torch
 from sentence_transformers import SentenceTransformer
 
+from academic_intelligence_ai.config import load_config
+from academic_intelligence_ai.db import connect
+from academic_intelligence_ai.load.chunk_files import parse_chunked_file
 from academic_intelligence_ai.monitoring.logger import get_logger
 from academic_intelligence_ai.monitoring.pipeline_tracker import PipelineTracker
 
@@ -17,17 +21,10 @@ logger = get_logger("load.load_documents")
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
-
-
 def init_db(db_path: Path) -> sqlite3.Connection:
     """Create SQLite database with documents and chunks tables."""
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     cur = conn.cursor()
 
     # Drop and recreate for clean schema on each full reload
@@ -61,6 +58,88 @@ def init_db(db_path: Path) -> sqlite3.Connection:
     return conn
 
 
+def choose_index_factory(num_vectors: int) -> str:
+    """Pick a FAISS index_factory string for the corpus size.
+
+    Exhaustive search is fine for small corpora; beyond that the vectors are
+    partitioned into ~sqrt(N) IVF cells, and very large corpora are also
+    product-quantized to cut memory.
+    """
+    nlist = max(1, int(math.sqrt(num_vectors)))
+    if num_vectors < 10_000:
+        return "Flat"
+    if num_vectors < 1_000_000:
+        return f"IVF{nlist},Flat"
+    return f"IVF{nlist},PQ32"
+
+
+def build_index(embeddings: np.ndarray, factory: str) -> faiss.Index:
+    """Build an inner-product FAISS index, training it first if required (IVF/PQ)."""
+    index = faiss.index_factory(embeddings.shape[1], factory, faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        index.train(embeddings)
+    index.add(embeddings)
+    return index
+
+
+def load_embedding_model(model_name: str) -> SentenceTransformer:
+    """Load the embedding model on CUDA in fp16 when available, otherwise on CPU."""
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        model = model.half()
+    return model
+
+
+@torch.inference_mode()
+def encode_texts(model: SentenceTransformer, texts: list[str], batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Encode texts into L2-normalized float32 embeddings.
+
+    All texts go through a single encode call so SentenceTransformers can
+    batch them internally. If that call fails, encoding is retried batch by
+    batch so a bad batch only zeroes its own rows.
+
+    Embeddings are always returned as float32 (as FAISS expects), even when
+    the model runs in fp16.
+
+    Returns (embeddings, failed) where failed is a boolean mask of the rows
+    whose batch could not be encoded (left as zero vectors).
+    """
+    try:
+        embeddings = model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype("float32", copy=False), np.zeros(len(texts), dtype=bool)
+    except Exception as e:
+        logger.error("Embedding failed for full corpus, retrying per batch: %s", e)
+
+    # Failed batches keep their zero rows
+    embeddings = np.zeros((len(texts), model.get_sentence_embedding_dimension()), dtype="float32")
+    failed = np.zeros(len(texts), dtype=bool)
+
+    for i in range(0, len(texts), batch_size):
+        batch_texts = texts[i : i + batch_size]
+        try:
+            embeddings[i : i + len(batch_texts)] = model.encode(
+                batch_texts,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        except Exception as e:
+            logger.error(
+                "Embedding failed for batch %d-%d: %s",
+                i, i + len(batch_texts), e,
+            )
+            failed[i : i + len(batch_texts)] = True
+
+    return embeddings, failed
+
+
 def run():
     """Load all chunked JSON files into SQLite and FAISS."""
     with PipelineTracker("load") as tracker:
@@ -85,89 +164,75 @@ def run():
 
         logger.info("Found %d chunked file(s) to load", len(json_files))
 
-        # Load embedding model
-        logger.info("Loading embedding model: %s", model_name)
-        model = SentenceTransformer(model_name)
+        # Parse files in parallel; DB inserts and encoding stay in this process
+        paths = [str(p) for p in json_files]
+        if len(paths) > 1:
+            with ProcessPoolExecutor() as ex:
+                parsed = list(ex.map(parse_chunked_file, paths, chunksize=8))
+        else:
+            parsed = [parse_chunked_file(p) for p in paths]
 
         # Init DB (drops and recreates tables for clean schema)
         conn = init_db(db_path)
-        cur = conn.cursor()
 
         all_texts = []
         metadata = []
-        doc_count = 0
-
-        for file_path in json_files:
-            payload = json.loads(file_path.read_text(encoding="utf-8"))
-
-            # Insert parent document
-            cur.execute(
-                "INSERT INTO documents (source, purpose, raw_filename, full_text_length, processed_at) VALUES (?, ?, ?, ?, ?)",
-                (
-                    payload["source"],
-                    payload.get("purpose", "unknown"),
-                    payload["raw_filename"],
-                    payload["full_text_length"],
-                    payload["processed_at"],
-                ),
-            )
-            doc_id = cur.lastrowid
-            doc_count += 1
-
-            # Insert each chunk
-            for chunk in payload["chunks"]:
-                cur.execute(
-                    "INSERT INTO chunks (doc_id, chunk_index, text, chunk_length, char_offset) VALUES (?, ?, ?, ?, ?)",
-                    (
-                        doc_id,
-                        chunk["chunk_index"],
-                        chunk["text"],
-                        chunk["chunk_length"],
-                        chunk["char_offset"],
-                    ),
-                )
-                chunk_id = cur.lastrowid
-
-                all_texts.append(chunk["text"])
+        doc_rows = []
+        chunk_rows = []
+
+        # Tables were just recreated, so row ids are assigned here instead of
+        # read back through cur.lastrowid; that lets every insert go through
+        # executemany in a single transaction.
+        for doc_id, (document, chunks) in enumerate(parsed, start=1):
+            source, purpose = document[0], document[1]
+            doc_rows.append((doc_id, *document))
+
+            for chunk_index, text, chunk_length, char_offset in chunks:
+                chunk_id = len(chunk_rows) + 1
+                chunk_rows.append((chunk_id, doc_id, chunk_index, text, chunk_length, char_offset))
+
+                all_texts.append(text)
                 metadata.append({
                     "chunk_id": chunk_id,
                     "doc_id": doc_id,
-                    "chunk_index": chunk["chunk_index"],
-                    "source": payload["source"],
-                    "purpose": payload.get("purpose", "unknown"),
+                    "chunk_index": chunk_index,
+                    "source": source,
+                    "purpose": purpose,
                 })
 
-            logger.info(
-                "Loaded %s (doc_id=%d, %d chunks)",
-                payload["source"], doc_id, len(payload["chunks"]),
-            )
+            logger.info("Loaded %s (doc_id=%d, %d chunks)", source, doc_id, len(chunks))
+
+        conn.executemany(
+            "INSERT INTO documents (id, source, purpose, raw_filename, full_text_length, processed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            doc_rows,
+        )
+        conn.executemany(
+            "INSERT INTO chunks (id, doc_id, chunk_index, text, chunk_length, char_offset) VALUES (?, ?, ?, ?, ?, ?)",
+            chunk_rows,
+        )
+        conn.commit()
 
+        # Secondary indexes are built once after the bulk insert instead of
+        # being maintained row by row (foreign_keys stays at SQLite's default OFF)
+        conn.execute("CREATE INDEX idx_chunks_doc_id ON chunks (doc_id)")
         conn.commit()
+        doc_count = len(doc_rows)
 
         # Detect empty or whitespace-only chunks
-        empty_chunks = sum(1 for t in all_texts if not t.strip())
+        empty_mask = np.array([not t.strip() for t in all_texts], dtype=bool)
+        empty_chunks = int(empty_mask.sum())
         if empty_chunks > 0:
             logger.warning("Detected %d empty/whitespace-only chunks", empty_chunks)
         tracker.add_metric("empty_chunks", empty_chunks)
 
-        # Encode all chunks in batches with failure detection
+        # Load embedding model (after the worker pool is gone)
+        logger.info("Loading embedding model: %s", model_name)
+        model = load_embedding_model(model_name)
+
+        # Encode all chunks with failure detection
         logger.info("Encoding %d chunks with %s (batch_size=%d)", len(all_texts), model_name, batch_size)
-        dim = embedding_cfg.get("dimension", 384)
-        all_embeddings = []
-        embedding_failures = 0
-
-        for i in range(0, len(all_texts), batch_size):
-            batch_texts = all_texts[i : i + batch_size]
-            try:
-                batch_embeddings = model.encode(batch_texts, show_progress_bar=False)
-                all_embeddings.append(np.array(batch_embeddings).astype("float32"))
-            except Exception as e:
-                logger.error(
-                    "Embedding failed for batch %d-%d: %s",
-                    i, i + len(batch_texts), e,
-                )
-                embedding_failures += len(batch_texts)
-                all_embeddings.append(np.zeros((len(batch_texts), dim), dtype="float32"))
+        embeddings_np, failed_mask = encode_texts(model, all_texts, batch_size)
+        embedding_failures = int(failed_mask.sum())
 
         if embedding_failures > 0:
             logger.warning(
@@ -178,20 +243,41 @@ def run():
         tracker.add_metric("embedding_failures", embedding_failures)
         tracker.add_metric("total_chunks_embedded", len(all_texts) - embedding_failures)
 
-        embeddings_np = np.vstack(all_embeddings).astype("float32")
-
-        # Build FAISS index (cosine similarity via normalized inner product)
-        faiss.normalize_L2(embeddings_np)
-        index = faiss.IndexFlatIP(embeddings_np.shape[1])
-        index.add(embeddings_np)
+        # Empty and failed chunks would only add zero vectors to the index;
+        # drop them and keep metadata aligned with the remaining rows
+        valid_mask = ~(empty_mask | failed_mask)
+        removed = len(all_texts) - int(valid_mask.sum())
+        if removed > 0:
+            logger.info("Excluding %d empty/failed chunks from the vector index", removed)
+            embeddings_np = embeddings_np[valid_mask]
+            metadata = [m for m, valid in zip(metadata, valid_mask) if valid]
 
         faiss_path.parent.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(index, str(faiss_path))
-        meta_path.write_bytes(pickle.dumps(metadata))
+        matrix_path = faiss_path.with_suffix(".npy")
+
+        factory = vector_cfg.get("factory", "auto")
+        if factory == "auto":
+            factory = choose_index_factory(len(embeddings_np))
+
+        if factory == "Flat":
+            # Exhaustive search needs no index structure: persist the normalized
+            # matrix and let the searcher score queries with one matmul
+            logger.info("Saving embedding matrix for exhaustive search: %s", matrix_path.name)
+            np.save(matrix_path, embeddings_np)
+            faiss_path.unlink(missing_ok=True)
+        else:
+            # Cosine similarity via inner product on normalized vectors
+            logger.info("Building FAISS index: %s", factory)
+            index = build_index(embeddings_np, factory)
+            faiss.write_index(index, str(faiss_path))
+            matrix_path.unlink(missing_ok=True)
+
+        with open(meta_path, "wb") as f:
+            pickle.dump(metadata, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         logger.info(
             "Load complete: %d documents, %d chunks, %d vectors (dim=%d), DB=%s",
-            doc_count, len(all_texts), index.ntotal, embeddings_np.shape[1], db_path.name,
+            doc_count, len(all_texts), len(embeddings_np), embeddings_np.shape[1], db_path.name,
         )
 
         tracker.record(
@@ -1,30 +1,41 @@
 import logging
+import multiprocessing
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-import yaml
+from academic_intelligence_ai.config import CONFIG_PATH, load_config
 
+_configured = False
 
-def setup_logger(name: str = "academic_intelligence_ai") -> logging.Logger:
-    """Configure and return the application logger based on config.yaml."""
-    config_path = Path(__file__).resolve().parents[3] / "config" / "config.yaml"
 
+def _log_settings() -> tuple[int, str]:
+    """Return (log level, log file path) from config.yaml, with defaults."""
     log_level = "INFO"
     log_file = "logs/pipeline.log"
 
-    if config_path.exists():
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+    if CONFIG_PATH.exists():
+        config = load_config(CONFIG_PATH)
         monitoring = config.get("monitoring", {})
         log_level = monitoring.get("log_level", log_level)
         log_file = monitoring.get("log_file", log_file)
 
+    return getattr(logging, log_level, logging.INFO), log_file
+
+
+def setup_logger(name: str = "academic_intelligence_ai") -> logging.Logger:
+    """Configure and return the application logger based on config.yaml."""
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, log_level, logging.INFO))
 
+    # Already configured: skip the config lookup entirely
     if logger.handlers:
         return logger
 
+    log_level, log_file = _log_settings()
+    logger.setLevel(log_level)
+
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)-7s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
@@ -35,12 +46,14 @@ def setup_logger(name: str = "academic_intelligence_ai") -> logging.Logger:
     console.setFormatter(formatter)
     logger.addHandler(console)
 
-    # File handler
+    # File handler: size-capped, fed through a buffer that flushes every
+    # 1024 records or immediately on ERROR. logging.shutdown() at interpreter
+    # exit flushes whatever is still buffered.
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler = RotatingFileHandler(log_path, maxBytes=10_000_000, backupCount=5, encoding="utf-8")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler))
 
     return logger
 
@@ -53,5 +66,53 @@ def get_logger(module_name: str) -> logging.Logger:
         logger = get_logger(__name__)
         logger.info("Ingestion started")
     """
-    setup_logger()
+    global _configured
+    if not _configured:
+        setup_logger()
+        _configured = True
     return logging.getLogger(f"academic_intelligence_ai.{module_name}")
+
+
+def flush_logs():
+    """Write out any buffered file-log records.
+
+    Call before forking workers so they do not inherit the buffer.
+    """
+    for handler in logging.getLogger("academic_intelligence_ai").handlers:
+        handler.flush()
+
+
+@contextmanager
+def worker_log_queue() -> Iterator[multiprocessing.Queue]:
+    """Route log records from worker processes through this process's handlers.
+
+    Yields a queue to pass to configure_worker_logging as a process pool
+    initializer. Only this process writes logs/pipeline.log: several processes
+    rotating the same file would rename it under each other.
+    """
+    flush_logs()
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, *setup_logger().handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        # Workers have exited by now, so every record they sent is queued
+        listener.stop()
+        log_queue.close()
+
+
+def configure_worker_logging(log_queue: multiprocessing.Queue):
+    """Process pool initializer: send this worker's log records to the parent's queue."""
+    global _configured
+    logger = logging.getLogger("academic_intelligence_ai")
+
+    # Drop handlers inherited on fork or opened while importing the main
+    # module; the parent's buffer was flushed before the pool started
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+    logger.setLevel(_log_settings()[0])
+    logger.addHandler(QueueHandler(log_queue))
+    _configured = True
@@ -1,8 +1,9 @@
-import sqlite3
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+from academic_intelligence_ai.db import connect
 from academic_intelligence_ai.monitoring.logger import get_logger
 
 logger = get_logger("monitoring.pipeline_tracker")
@@ -12,42 +13,44 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 DB_PATH = PROJECT_ROOT / "data" / "academic.db"
 
-
-def _init_tracking_table():
-    """Create the pipeline_runs table if it does not exist."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS pipeline_runs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_at TEXT NOT NULL,
-            step TEXT NOT NULL,
-            duration_sec REAL NOT NULL,
-            items_in INTEGER NOT NULL,
-            items_out INTEGER NOT NULL,
-            items_skipped INTEGER NOT NULL,
-            status TEXT NOT NULL
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-
-def _init_metrics_table():
-    """Create the run_metrics table if it does not exist."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS run_metrics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id INTEGER NOT NULL,
-            metric_name TEXT NOT NULL,
-            metric_value REAL NOT NULL,
-            FOREIGN KEY (run_id) REFERENCES pipeline_runs(id)
-        )
-    """)
-    conn.commit()
-    conn.close()
+# Set once the tracking tables are known to exist in this process
+_SCHEMA_READY = False
+_SCHEMA_LOCK = threading.Lock()
+
+
+def _ensure_schema():
+    """Create the pipeline_runs and run_metrics tables if needed (once per process)."""
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
+    with _SCHEMA_LOCK:
+        if _SCHEMA_READY:
+            return
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = connect(DB_PATH)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pipeline_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_at TEXT NOT NULL,
+                step TEXT NOT NULL,
+                duration_sec REAL NOT NULL,
+                items_in INTEGER NOT NULL,
+                items_out INTEGER NOT NULL,
+                items_skipped INTEGER NOT NULL,
+                status TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS run_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                metric_name TEXT NOT NULL,
+                metric_value REAL NOT NULL,
+                FOREIGN KEY (run_id) REFERENCES pipeline_runs(id)
+            );
+        """)
+        conn.close()
+        _SCHEMA_READY = True
 
 
 class PipelineTracker:
@@ -89,8 +92,8 @@ class PipelineTracker:
     def get_previous_metric(step: str, metric_name: str) -> float | None:
         """Retrieve the most recent value for a given metric from a previous run."""
         try:
-            _init_metrics_table()
-            conn = sqlite3.connect(DB_PATH)
+            _ensure_schema()
+            conn = connect(DB_PATH)
             row = conn.execute(
                 """
                 SELECT rm.metric_value
@@ -120,9 +123,11 @@ class PipelineTracker:
         )
 
         try:
-            _init_tracking_table()
-            _init_metrics_table()
-            conn = sqlite3.connect(DB_PATH)
+            _ensure_schema()
+            conn = connect(DB_PATH)
+            # Take the write lock up front so a concurrent writer makes us wait
+            # on busy_timeout instead of failing mid-transaction with SQLITE_BUSY
+            conn.execute("BEGIN IMMEDIATE")
             cursor = conn.execute(
                 "INSERT INTO pipeline_runs (run_at, step, duration_sec, items_in, items_out, items_skipped, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (
@@ -137,11 +142,10 @@ class PipelineTracker:
             )
             run_id = cursor.lastrowid
 
-            for metric_name, metric_value in self.metrics.items():
-                conn.execute(
-                    "INSERT INTO run_metrics (run_id, metric_name, metric_value) VALUES (?, ?, ?)",
-                    (run_id, metric_name, metric_value),
-                )
+            conn.executemany(
+                "INSERT INTO run_metrics (run_id, metric_name, metric_value) VALUES (?, ?, ?)",
+                [(run_id, name, value) for name, value in self.metrics.items()],
+            )
 
             conn.commit()
             conn.close()
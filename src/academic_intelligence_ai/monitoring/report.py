@@ -1,4 +1,6 @@
+import json
 import sqlite3
+from collections import defaultdict
 from pathlib import Path
 
 from academic_intelligence_ai.monitoring.logger import get_logger
@@ -7,33 +9,60 @@ logger = get_logger("monitoring.report")
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DB_PATH = PROJECT_ROOT / "data" / "academic.db"
+# Last rendered report, keyed on the newest pipeline_runs row it covers
+REPORT_CACHE_PATH = PROJECT_ROOT / "data" / ".report_cache.json"
 
 STEPS = ["extract", "transform", "chunk", "load"]
 
-
-def _get_last_two_runs(conn: sqlite3.Connection, step: str) -> list[dict]:
-    """Get the last two runs for a given step, newest first."""
+# Core pipeline_runs fields shown per step: (label, run dict key)
+FIELDS = [
+    ("Duration (s)", "duration"),
+    ("Items in", "items_in"),
+    ("Items out", "items_out"),
+    ("Skipped", "items_skipped"),
+    ("Status", "status"),
+]
+
+# Report layout, built once: label, current, previous, diff indicator
+_ROW = "  {:30s} {:>12s}  {:>12s}{}"
+_TOTAL_ROW = "  {:30s} {:>11.1f}s"
+_RULE = "=" * 60
+_SEPARATOR = "  " + "-" * 56
+_TITLE = "  PIPELINE REPORT — Last vs Previous"
+_COLUMN_HEADER = _ROW.format("", "Current", "Previous", "")
+
+def _get_last_two_runs(conn: sqlite3.Connection) -> dict[str, list[dict]]:
+    """Get the last two runs for every step in one query.
+
+    Returns a dict of step -> runs, newest first (empty list if the step never ran).
+    """
     rows = conn.execute(
         """
-        SELECT id, run_at, duration_sec, items_in, items_out, items_skipped, status
-        FROM pipeline_runs
-        WHERE step = ?
-        ORDER BY id DESC
-        LIMIT 2
-        """,
-        (step,),
+        SELECT step, id, run_at, duration_sec, items_in, items_out, items_skipped, status
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY step ORDER BY id DESC) AS rn
+            FROM pipeline_runs
+        )
+        WHERE rn <= 2
+        ORDER BY step, id DESC
+        """
     ).fetchall()
 
-    runs = []
+    # Metrics for all selected runs in a single round-trip
+    run_ids = [row[1] for row in rows]
+    metrics_by_run: dict[int, dict] = defaultdict(dict)
+    if run_ids:
+        placeholders = ",".join("?" * len(run_ids))
+        for run_id, name, value in conn.execute(
+            f"SELECT run_id, metric_name, metric_value FROM run_metrics WHERE run_id IN ({placeholders})",
+            run_ids,
+        ):
+            metrics_by_run[run_id][name] = value
+
+    runs_by_step: dict[str, list[dict]] = {step: [] for step in STEPS}
     for row in rows:
-        run_id, run_at, duration, items_in, items_out, items_skipped, status = row
-        metrics = dict(
-            conn.execute(
-                "SELECT metric_name, metric_value FROM run_metrics WHERE run_id = ?",
-                (run_id,),
-            ).fetchall()
-        )
-        runs.append({
+        step, run_id, run_at, duration, items_in, items_out, items_skipped, status = row
+        runs_by_step.setdefault(step, []).append({
             "run_id": run_id,
             "run_at": run_at[:16],  # trim seconds
             "duration": duration,
@@ -41,10 +70,10 @@ def _get_last_two_runs(conn: sqlite3.Connection, step: str) -> list[dict]:
             "items_out": items_out,
             "items_skipped": items_skipped,
             "status": status,
-            "metrics": metrics,
+            "metrics": metrics_by_run[run_id],
         })
 
-    return runs
+    return runs_by_step
 
 
 def _format_value(value) -> str:
@@ -67,16 +96,51 @@ def _diff_indicator(current, previous) -> str:
     return " (changed)"
 
 
+def _load_cached_report(latest: list) -> str | None:
+    """Return the cached report if it was rendered for the same latest run."""
+    try:
+        cached = json.loads(REPORT_CACHE_PATH.read_bytes())
+        if cached.get("latest_run") == latest:
+            return cached["report"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    return None
+
+
+def _save_cached_report(latest: list, report: str):
+    """Persist the rendered report; failures only cost the next cache hit."""
+    try:
+        REPORT_CACHE_PATH.write_text(
+            json.dumps({"latest_run": latest, "report": report}, ensure_ascii=False), encoding="utf-8"
+        )
+    except OSError:
+        pass
+
+
 def generate_report() -> str:
     """Generate a comparison report of the last two pipeline runs."""
     if not DB_PATH.exists():
         return "No database found. Run the pipeline first."
 
-    conn = sqlite3.connect(DB_PATH)
-    lines = ["", "=" * 60, "  PIPELINE REPORT — Last vs Previous", "=" * 60]
+    # Read-only: the report never writes, so it cannot take the write lock
+    # from a running pipeline step
+    conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+    # Runs are append-only, so the report only changes when a new run lands;
+    # run_at guards against a recreated database reusing the same id
+    row = conn.execute("SELECT id, run_at FROM pipeline_runs ORDER BY id DESC LIMIT 1").fetchone()
+    latest = list(row) if row else None
+    cached = _load_cached_report(latest)
+    if cached is not None:
+        conn.close()
+        return cached
+
+    runs_by_step = _get_last_two_runs(conn)
+    conn.close()
+
+    lines = ["", _RULE, _TITLE, _RULE]
 
     for step in STEPS:
-        runs = _get_last_two_runs(conn, step)
+        runs = runs_by_step[step]
 
         if not runs:
             lines.append(f"\n  {step}: no runs yet")
@@ -87,27 +151,19 @@ def generate_report() -> str:
 
         lines.append("")
         lines.append(f"  [{step.upper()}]")
-        lines.append(f"  {'':30s} {'Current':>12s}  {'Previous':>12s}")
-        lines.append(f"  {'-' * 56}")
+        lines.append(_COLUMN_HEADER)
+        lines.append(_SEPARATOR)
 
         # Timestamp
         prev_at = previous["run_at"] if previous else "-"
-        lines.append(f"  {'Date':30s} {current['run_at']:>12s}  {prev_at:>12s}")
+        lines.append(_ROW.format("Date", current["run_at"], prev_at, ""))
 
         # Core fields
-        fields = [
-            ("Duration (s)", "duration"),
-            ("Items in", "items_in"),
-            ("Items out", "items_out"),
-            ("Skipped", "items_skipped"),
-            ("Status", "status"),
-        ]
-
-        for label, key in fields:
+        for label, key in FIELDS:
             cur_val = current[key]
             prev_val = previous[key] if previous else "-"
             diff = _diff_indicator(cur_val, prev_val) if previous else ""
-            lines.append(f"  {label:30s} {_format_value(cur_val):>12s}  {_format_value(prev_val):>12s}{diff}")
+            lines.append(_ROW.format(label, _format_value(cur_val), _format_value(prev_val), diff))
 
         # Metrics
         all_metric_names = set(current["metrics"].keys())
@@ -120,28 +176,29 @@ def generate_report() -> str:
             diff = ""
             if previous and isinstance(cur_val, (int, float)) and isinstance(prev_val, (int, float)):
                 diff = _diff_indicator(cur_val, prev_val)
-            lines.append(f"  {metric:30s} {_format_value(cur_val):>12s}  {_format_value(prev_val):>12s}{diff}")
+            lines.append(_ROW.format(metric, _format_value(cur_val), _format_value(prev_val), diff))
 
     # Total duration
     lines.append("")
-    lines.append(f"  {'-' * 56}")
+    lines.append(_SEPARATOR)
 
     for label, idx in [("Current total", 0), ("Previous total", 1)]:
         total = 0.0
         has_data = False
         for step in STEPS:
-            runs = _get_last_two_runs(conn, step)
+            runs = runs_by_step[step]
             if len(runs) > idx:
                 total += runs[idx]["duration"]
                 has_data = True
         if has_data:
-            lines.append(f"  {label + ' duration':30s} {total:>11.1f}s")
+            lines.append(_TOTAL_ROW.format(label + " duration", total))
 
-    lines.append("=" * 60)
+    lines.append(_RULE)
     lines.append("")
 
-    conn.close()
-    return "\n".join(lines)
+    report = "\n".join(lines)
+    _save_cached_report(latest, report)
+    return report
 
 
 def print_report():
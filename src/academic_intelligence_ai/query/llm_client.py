@@ -1,21 +1,10 @@
 import requests
-from pathlib import Path
-
-import yaml
 
+from academic_intelligence_ai.config import load_config
 from academic_intelligence_ai.monitoring.logger import get_logger
 
 logger = get_logger("query.llm_client")
 
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
-
-
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
-
 
 class LLMClient:
     """Client for communicating with a local Ollama LLM instance."""
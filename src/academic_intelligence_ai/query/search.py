@@ -4,9 +4,9 @@ from pathlib import Path
 
 import faiss
 import numpy as np
-import yaml
 from sentence_transformers import SentenceTransformer
 
+from academic_intelligence_ai.config import load_config
 from academic_intelligence_ai.monitoring.logger import get_logger
 
 logger = get_logger("query.search")
@@ -14,15 +14,35 @@ logger = get_logger("query.search")
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+def search_matrix(query_vectors: np.ndarray, embeddings: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Exhaustive inner-product search over a plain embedding matrix.
+
+    Mirrors faiss.Index.search: returns (scores, indices), each of shape
+    (num_queries, k), best first, padded with -1 indices when k exceeds
+    the number of vectors.
+    """
+    scores = query_vectors @ embeddings.T
+    n = scores.shape[1]
+    kk = min(k, n)
+
+    if kk < n:
+        top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+    else:
+        top = np.broadcast_to(np.arange(n), (len(scores), n))
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    if kk < k:
+        pad = k - kk
+        top = np.pad(top, ((0, 0), (0, pad)), constant_values=-1)
+        top_scores = np.pad(top_scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+    return top_scores, top
 
 
 class Searcher:
-    """Loads FAISS index, metadata and embedding model once, reuses across queries."""
+    """Loads the vector index, metadata and embedding model once, reuses across queries."""
 
     def __init__(self):
         config = load_config()
@@ -42,15 +62,36 @@ class Searcher:
         logger.info("Loading embedding model: %s", model_name)
         self.model = SentenceTransformer(model_name)
 
-        logger.info("Loading FAISS index from %s", faiss_path)
-        self.index = faiss.read_index(str(faiss_path))
-
-        self.metadata = pickle.loads(meta_path.read_bytes())
+        # Flat corpora are stored as a plain normalized matrix (see load_documents)
+        matrix_path = faiss_path.with_suffix(".npy")
+        if matrix_path.exists():
+            logger.info("Loading embedding matrix from %s", matrix_path)
+            self.embeddings = np.load(matrix_path)
+            self.index = None
+            self.ntotal = len(self.embeddings)
+        else:
+            logger.info("Loading FAISS index from %s", faiss_path)
+            self.embeddings = None
+            self.index = faiss.read_index(str(faiss_path))
+            self.ntotal = self.index.ntotal
+
+            # IVF indexes only scan nprobe cells per query; no-op for Flat.
+            # auto scales with nlist (sqrt(N) for auto factories) to keep recall
+            ivf = faiss.try_extract_index_ivf(self.index)
+            if ivf is not None:
+                nprobe = vector_cfg.get("nprobe", "auto")
+                if nprobe == "auto":
+                    nprobe = max(8, ivf.nlist // 16)
+                ivf.nprobe = nprobe
+                logger.info("IVF index: nlist=%d, nprobe=%d", ivf.nlist, nprobe)
+
+        with open(meta_path, "rb") as f:
+            self.metadata = pickle.load(f)
         self.conn = sqlite3.connect(db_path)
 
         logger.info(
             "Searcher ready: %d vectors, %d metadata entries",
-            self.index.ntotal, len(self.metadata),
+            self.ntotal, len(self.metadata),
         )
 
     def search(self, query: str, top_k: int | None = None) -> list[dict]:
@@ -63,11 +104,14 @@ class Searcher:
             top_k = self.max_context_chunks
 
         # Encode and normalize query vector (index uses cosine via normalized IP)
-        query_vector = self.model.encode(query).astype("float32")
-        query_vector = np.expand_dims(query_vector, axis=0)
-        faiss.normalize_L2(query_vector)
-
-        distances, indices = self.index.search(query_vector, top_k)
+        query_vector = self.model.encode(
+            [query], convert_to_numpy=True, normalize_embeddings=True,
+        ).astype("float32", copy=False)
+
+        if self.index is not None:
+            distances, indices = self.index.search(query_vector, top_k)
+        else:
+            distances, indices = search_matrix(query_vector, self.embeddings, top_k)
 
         results = []
         for score, idx in zip(distances[0], indices[0]):
@@ -1,10 +1,18 @@
-import json
+import io
+import os
+from collections.abc import Iterator
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
-import yaml
+import orjson
+import zstandard
 
+from academic_intelligence_ai.config import load_config
 from academic_intelligence_ai.monitoring.logger import get_logger
 from academic_intelligence_ai.monitoring.pipeline_tracker import PipelineTracker
+from academic_intelligence_ai.transform.html_to_text import NDJSON_FILENAME
+from academic_intelligence_ai.transform.parallel import map_files
 
 logger = get_logger("transform.chunker")
 
@@ -12,91 +20,139 @@ logger = get_logger("transform.chunker")
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
 
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
-
-
-def chunk_text(text: str, chunk_size: int, chunk_overlap: int, min_chunk_size: int) -> list[dict]:
+def chunk_text(
+    text: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    min_chunk_size: int,
+    store_text: bool = True,
+) -> Iterator[dict]:
     """Split text into overlapping chunks respecting word boundaries.
 
-    Uses a character-based sliding window. When the window end lands
+    Uses a character-based sliding window of chunk_size characters with a
+    stride of at most chunk_size - chunk_overlap. When the window end lands
     mid-word, it backs up to the last whitespace so no word is cut.
     Chunks shorter than min_chunk_size are discarded.
 
-    Returns a list of dicts with keys: chunk_index, text, char_offset, chunk_length.
+    Yields dicts with keys: chunk_index, text, char_offset, chunk_length.
+    In every mode, char_offset points at the first character of the stripped
+    chunk rather than the raw window start (which could be whitespace), so
+    text[char_offset:char_offset + chunk_length] is always the chunk text.
+    This is also the value stored in chunks.char_offset. With
+    store_text=False the text key is left out.
     """
-    if len(text) <= chunk_size:
-        if len(text) >= min_chunk_size:
-            return [{"chunk_index": 0, "text": text, "char_offset": 0, "chunk_length": len(text)}]
-        return []
-
-    chunks = []
+    n = len(text)
+    if n <= chunk_size:
+        if n >= min_chunk_size:
+            chunk = {"chunk_index": 0, "char_offset": 0, "chunk_length": n}
+            if store_text:
+                chunk["text"] = text
+            yield chunk
+        return
+
+    chunk_index = 0
     start = 0
 
-    while start < len(text):
+    while start < n:
         end = start + chunk_size
 
-        if end >= len(text):
+        if end >= n:
             # Last chunk: take everything remaining
             chunk = text[start:].strip()
             if len(chunk) >= min_chunk_size:
-                chunks.append({
-                    "chunk_index": len(chunks),
-                    "text": chunk,
-                    "char_offset": start,
-                    "chunk_length": len(chunk),
-                })
+                yield _make_chunk(text, chunk, chunk_index, start, store_text)
             break
 
-        # Back up to last space to avoid cutting mid-word
-        boundary = end
-        while boundary > start and text[boundary] != " ":
-            boundary -= 1
-
-        # If no space found (one huge word), force-cut at chunk_size
-        if boundary == start:
+        # Back up to the last space in (start, end] to avoid cutting mid-word;
+        # if there is none (one huge word), force-cut at chunk_size
+        boundary = text.rfind(" ", start + 1, end + 1)
+        if boundary == -1:
             boundary = end
 
         chunk = text[start:boundary].strip()
         if len(chunk) >= min_chunk_size:
-            chunks.append({
-                "chunk_index": len(chunks),
-                "text": chunk,
-                "char_offset": start,
-                "chunk_length": len(chunk),
-            })
+            yield _make_chunk(text, chunk, chunk_index, start, store_text)
+            chunk_index += 1
 
         step = boundary - start - chunk_overlap
         if step <= 0:
             step = 1
         start = start + step
 
-    return chunks
 
+def _make_chunk(text: str, chunk: str, chunk_index: int, start: int, store_text: bool) -> dict:
+    """Build a chunk dict for a stripped window of text starting at start."""
+    # Skip the whitespace strip() removed so the offset slices back to the chunk
+    offset = text.index(chunk[0], start) if chunk else start
+    result = {"chunk_index": chunk_index, "char_offset": offset, "chunk_length": len(chunk)}
+    if store_text:
+        result["text"] = chunk
+    return result
+
+
+def _read_cached_lengths(output_path: Path, newer_than_ns: int, chunk_cfg: dict) -> list[int] | None:
+    """Return the chunk lengths of an up-to-date chunked file, or None.
 
-def process_file(file_path: Path, chunk_cfg: dict, output_dir: Path) -> tuple[int, list[int]]:
+    The file is up to date when it is at least as new as newer_than_ns and was
+    written with the current chunk settings.
+    """
+    try:
+        if output_path.stat().st_mtime_ns < newer_than_ns:
+            return None
+        payload = orjson.loads(output_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+    chunk_config = {
+        "chunk_size": chunk_cfg.get("chunk_size", 400),
+        "chunk_overlap": chunk_cfg.get("chunk_overlap", 80),
+        "min_chunk_size": chunk_cfg.get("min_chunk_size", 50),
+    }
+    # Offsets-only files carry the full text at the top level
+    if payload.get("chunk_config") != chunk_config or ("text" not in payload) != chunk_cfg.get("store_text", True):
+        return None
+    return [c["chunk_length"] for c in payload["chunks"]]
+
+
+def process_file(file_path: str, chunk_cfg: dict, output_dir: Path) -> tuple[int, list[int]]:
     """Chunk a single processed JSON file.
 
+    An existing chunked file newer than the input and written with the same
+    chunking settings is reused as is; its lengths are still returned so run() stats stay complete.
+    Returns (num_chunks, list_of_chunk_lengths).
+    """
+    output_path = output_dir / os.path.basename(file_path)
+    lengths = _read_cached_lengths(output_path, os.stat(file_path).st_mtime_ns, chunk_cfg)
+    if lengths is not None:
+        logger.info("Unchanged %s, reusing %s (%d chunks)", os.path.basename(file_path), output_path.name, len(lengths))
+        return len(lengths), lengths
+
+    with open(file_path, "rb") as f:
+        return chunk_document(f.read(), chunk_cfg, output_dir)
+
+
+def chunk_document(raw: bytes, chunk_cfg: dict, output_dir: Path) -> tuple[int, list[int]]:
+    """Chunk one serialized processed document (a JSON file or NDJSON line).
+
     Returns (num_chunks, list_of_chunk_lengths).
     """
     chunk_size = chunk_cfg.get("chunk_size", 400)
     chunk_overlap = chunk_cfg.get("chunk_overlap", 80)
     min_chunk_size = chunk_cfg.get("min_chunk_size", 50)
+    store_text = chunk_cfg.get("store_text", True)
 
-    payload = json.loads(file_path.read_text(encoding="utf-8"))
+    payload = orjson.loads(raw)
     text = payload["text"]
     meta = payload["metadata"]
 
-    chunks = chunk_text(text, chunk_size, chunk_overlap, min_chunk_size)
+    chunks = chunk_text(text, chunk_size, chunk_overlap, min_chunk_size, store_text)
+    first = next(chunks, None)
 
-    if not chunks:
+    if first is None:
         logger.warning("No chunks produced for %s (text_length=%d)", meta["source"], len(text))
         return 0, []
 
-    output = {
+    header = {
         "source": meta["source"],
         "purpose": meta.get("purpose", "unknown"),
         "raw_filename": meta["raw_filename"],
@@ -107,25 +163,40 @@ def process_file(file_path: Path, chunk_cfg: dict, output_dir: Path) -> tuple[in
             "chunk_overlap": chunk_overlap,
             "min_chunk_size": min_chunk_size,
         },
-        "chunks": chunks,
     }
+    if not store_text:
+        # Chunks carry only offsets; keep one copy of the text to slice from
+        header["text"] = text
 
+    # Stream chunks straight into the "chunks" array instead of building the
+    # whole output document in memory first
+    lengths = []
     output_path = output_dir / f"{meta['source']}.json"
-    output_path.write_text(
-        json.dumps(output, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(header)[:-1] + b',"chunks":[')
+        for chunk in chain([first], chunks):
+            if lengths:
+                f.write(b",")
+            f.write(orjson.dumps(chunk))
+            lengths.append(chunk["chunk_length"])
+        f.write(b"]}")
 
-    lengths = [c["chunk_length"] for c in chunks]
     logger.info(
         "Chunked %s -> %d chunks (avg %.0f chars)",
-        meta["source"], len(chunks), sum(lengths) / len(lengths),
+        meta["source"], len(lengths), sum(lengths) / len(lengths),
     )
-    return len(chunks), lengths
+    return len(lengths), lengths
+
+
+def read_ndjson(path: Path) -> list[bytes]:
+    """Read the non-empty lines of a zstd-compressed NDJSON stream."""
+    with open(path, "rb") as f:
+        reader = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(f))
+        return [line for line in reader if line.strip()]
 
 
 def run():
-    """Chunk all processed JSON files in data/processed/."""
+    """Chunk all processed documents in data/processed/."""
     with PipelineTracker("chunk") as tracker:
         config = load_config()
         chunk_cfg = config.get("chunking", {})
@@ -134,13 +205,26 @@ def run():
         output_dir = PROJECT_ROOT / "data" / "chunked"
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        json_files = list(processed_dir.glob("*.json"))
-        if not json_files:
-            logger.warning("No processed JSON files found in %s", processed_dir)
+        use_ndjson = config.get("transform", {}).get("use_ndjson", False)
+        ndjson_path = processed_dir / NDJSON_FILENAME
+        if use_ndjson:
+            inputs = read_ndjson(ndjson_path) if ndjson_path.exists() else []
+            worker = partial(chunk_document, chunk_cfg=chunk_cfg, output_dir=output_dir)
+        else:
+            inputs = (
+                [e.path for e in os.scandir(processed_dir) if e.name.endswith(".json") and e.is_file()]
+                if processed_dir.is_dir() else []
+            )
+            # Per-file outputs are skipped when already newer than their input
+            # and chunked with the same settings; the NDJSON stream is always re-chunked
+            worker = partial(process_file, chunk_cfg=chunk_cfg, output_dir=output_dir)
+
+        if not inputs:
+            logger.warning("No processed documents found in %s", processed_dir)
             tracker.record(items_in=0, items_out=0, items_skipped=0)
             return
 
-        logger.info("Found %d processed file(s) to chunk", len(json_files))
+        logger.info("Found %d processed document(s) to chunk", len(inputs))
 
         monitoring_cfg = config.get("monitoring", {})
         anomaly_threshold = monitoring_cfg.get("chunk_drift_threshold_pct", 20.0)
@@ -150,22 +234,23 @@ def run():
         all_chunk_lengths: list[int] = []
         empty_files = 0
 
-        for file_path in json_files:
-            try:
-                count, lengths = process_file(file_path, chunk_cfg, output_dir)
-                if count > 0:
-                    total_chunks += count
-                    all_chunk_lengths.extend(lengths)
-                else:
-                    empty_files += 1
-                    skipped += 1
-            except Exception as e:
-                logger.error("Failed to chunk %s: %s", file_path.name, e)
+        for item, result, error in map_files(worker, inputs):
+            if error is not None:
+                name = f"a record of {NDJSON_FILENAME}" if use_ndjson else os.path.basename(item)
+                logger.error("Failed to chunk %s: %s", name, error)
+                skipped += 1
+                continue
+            count, lengths = result
+            if count > 0:
+                total_chunks += count
+                all_chunk_lengths.extend(lengths)
+            else:
+                empty_files += 1
                 skipped += 1
 
         logger.info(
             "Chunking complete: %d files -> %d total chunks, %d skipped",
-            len(json_files), total_chunks, skipped,
+            len(inputs), total_chunks, skipped,
         )
 
         # Chunk size metrics
@@ -195,7 +280,7 @@ def run():
                         drift_pct, avg_len, prev_avg,
                     )
 
-        tracker.record(items_in=len(json_files), items_out=total_chunks, items_skipped=skipped)
+        tracker.record(items_in=len(inputs), items_out=total_chunks, items_skipped=skipped)
 
 
 if __name__ == "__main__":
@@ -1,37 +1,46 @@
-import json
+import os
 import re
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timezone
 
-import yaml
-from bs4 import BeautifulSoup
+import orjson
+import zstandard
+from selectolax.lexbor import LexborHTMLParser
 
+from academic_intelligence_ai.config import CONFIG_PATH, load_config
 from academic_intelligence_ai.monitoring.logger import get_logger
 from academic_intelligence_ai.monitoring.pipeline_tracker import PipelineTracker
+from academic_intelligence_ai.transform.parallel import map_files
 
 logger = get_logger("transform.html_to_text")
 
 # Project root: 4 levels up (transform -> academic_intelligence_ai -> src -> root)
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 
+_WS_RE = re.compile(r"\s+")
 
-def load_config() -> dict:
-    """Load configuration from config/config.yaml."""
-    config_path = PROJECT_ROOT / "config" / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+# With transform.use_ndjson, all processed documents go into this single
+# zstd-compressed NDJSON stream in data/processed/ instead of one JSON each
+NDJSON_FILENAME = "all.ndjson.zst"
+ZSTD_LEVEL = 3
 
+DEFAULT_STRIP_TAGS = ("script", "style", "noscript", "header", "footer", "nav")
 
-def clean_html(html: str, strip_tags: list[str]) -> str:
-    """Remove unwanted tags and extract clean text from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
 
-    for tag in soup(strip_tags):
-        tag.decompose()
+def clean_html(html: str | bytes, strip_tags: tuple[str, ...]) -> str:
+    """Remove unwanted tags and extract clean text from HTML.
 
-    text = soup.get_text(separator=" ")
+    Raw bytes are decoded by the parser using the document's declared charset.
+    """
+    tree = LexborHTMLParser(html, encoding=True)
+
+    tree.strip_tags(list(strip_tags), recursive=True)
+
+    root = tree.root
+    text = root.text(separator=" ") if root is not None else ""
     # Collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WS_RE.sub(" ", text).strip()
     return text
 
 
@@ -40,51 +49,93 @@ def build_source_map(config: dict) -> dict[str, str]:
     return {s["name"]: s.get("purpose", "unknown") for s in config.get("sources", [])}
 
 
-def extract_metadata(file_path: Path, text: str, purpose: str) -> dict:
+def extract_metadata(file_path: Path, text: str, purpose: str, processed_at: str) -> dict:
     """Build metadata dict from the raw file and extracted text."""
     return {
         "source": file_path.stem,
         "purpose": purpose,
         "raw_filename": file_path.name,
-        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "processed_at": processed_at,
         "text_length": len(text),
     }
 
 
-def process_file(file_path: Path, config: dict, source_map: dict[str, str]) -> bool:
-    """Process a single raw HTML file into a structured JSON output.
-
-    Returns True if processed successfully, False if skipped.
+def process_file(
+    file_path: Path,
+    raw: bytes,
+    min_text_length: int,
+    strip_tags: tuple[str, ...],
+    source_map: dict[str, str],
+    processed_dir: Path,
+    processed_at: str,
+    use_ndjson: bool = False,
+) -> tuple[bool, bytes | None]:
+    """Process a single raw HTML file (already read into raw) into a structured JSON output.
+
+    Returns (processed, line): processed is False if the file was skipped.
+    With use_ndjson the payload is not written here; line is the NDJSON record
+    for the caller to append to the stream. Otherwise line is None.
     """
-    transform_cfg = config.get("transform", {})
-    min_text_length = transform_cfg.get("min_text_length", 500)
-    strip_tags = transform_cfg.get("strip_tags", ["script", "style", "noscript", "header", "footer", "nav"])
-
-    html = file_path.read_text(encoding="utf-8")
-    text = clean_html(html, strip_tags)
+    text = clean_html(raw, strip_tags)
 
     if len(text) < min_text_length:
         logger.warning("Skipping %s: text too short (%d chars, minimum %d)", file_path.name, len(text), min_text_length)
-        return False
+        return False, None
 
     purpose = source_map.get(file_path.stem, "unknown")
-    metadata = extract_metadata(file_path, text, purpose)
+    metadata = extract_metadata(file_path, text, purpose, processed_at)
 
-    processed_dir = PROJECT_ROOT / "data" / "processed"
-    processed_dir.mkdir(parents=True, exist_ok=True)
-
-    output_path = processed_dir / f"{file_path.stem}.json"
     payload = {
         "text": text,
         "metadata": metadata,
     }
-    output_path.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    if use_ndjson:
+        logger.info("Processed %s -> %s (%d chars)", file_path.name, NDJSON_FILENAME, len(text))
+        return True, orjson.dumps(payload) + b"\n"
+
+    output_path = processed_dir / f"{file_path.stem}.json"
+    output_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
 
     logger.info("Processed %s -> %s (%d chars)", file_path.name, output_path.name, len(text))
-    return True
+    return True, None
+
+
+def transform_file(
+    file_path: str,
+    min_text_length: int,
+    strip_tags: tuple[str, ...],
+    source_map: dict[str, str],
+    processed_dir: Path,
+    processed_at: str,
+    use_ndjson: bool = False,
+    config_mtime_ns: int = 0,
+) -> tuple[str, bytes | None]:
+    """Check and process one raw HTML file (runs in a worker process).
+
+    Takes the path as a plain string, which is cheaper to send to the worker.
+    Returns (outcome, line) where outcome is "processed", "skipped" (text too
+    short), "empty" (blank raw file) or "cached" (existing output is newer
+    than both the raw file and the config), and line is the NDJSON record if any.
+    """
+    file_path = Path(file_path)
+    if not use_ndjson:
+        output_path = processed_dir / f"{file_path.stem}.json"
+        try:
+            if output_path.stat().st_mtime_ns >= max(file_path.stat().st_mtime_ns, config_mtime_ns):
+                logger.info("Unchanged %s, keeping %s", file_path.name, output_path.name)
+                return "cached", None
+        except FileNotFoundError:
+            pass
+
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    if not raw.strip():
+        logger.warning("Empty raw file detected: %s", file_path.name)
+        return "empty", None
+    processed, line = process_file(
+        file_path, raw, min_text_length, strip_tags, source_map, processed_dir, processed_at, use_ndjson
+    )
+    return ("processed" if processed else "skipped"), line
 
 
 def run():
@@ -93,7 +144,10 @@ def run():
         config = load_config()
         raw_dir = PROJECT_ROOT / "data" / "raw"
 
-        html_files = list(raw_dir.glob("*.html"))
+        html_files = (
+            [e.path for e in os.scandir(raw_dir) if e.name.endswith(".html") and e.is_file()]
+            if raw_dir.is_dir() else []
+        )
         if not html_files:
             logger.warning("No HTML files found in %s", raw_dir)
             tracker.record(items_in=0, items_out=0, items_skipped=0)
@@ -102,27 +156,66 @@ def run():
         source_map = build_source_map(config)
         logger.info("Found %d raw HTML file(s) to process", len(html_files))
 
+        # Resolve settings once here rather than in every worker call
+        transform_cfg = config.get("transform", {})
+        min_text_length = transform_cfg.get("min_text_length", 500)
+        strip_tags = tuple(transform_cfg.get("strip_tags", DEFAULT_STRIP_TAGS))
+        use_ndjson = transform_cfg.get("use_ndjson", False)
+
+        processed_dir = PROJECT_ROOT / "data" / "processed"
+        processed_dir.mkdir(parents=True, exist_ok=True)
+
+        # One timestamp for the whole batch
+        processed_at = datetime.now(timezone.utc).isoformat()
+
         processed = 0
         skipped = 0
         empty_files = 0
-
-        for file_path in html_files:
-            try:
-                raw_html = file_path.read_text(encoding="utf-8")
-                if not raw_html.strip():
-                    logger.warning("Empty raw file detected: %s", file_path.name)
-                    empty_files += 1
+        cached_files = 0
+
+        # Workers only build NDJSON records; the parent owns the single
+        # compressed stream and appends them as they complete. Closing the
+        # writer also closes the underlying file.
+        ndjson_writer = None
+        if use_ndjson:
+            ndjson_writer = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(
+                open(processed_dir / NDJSON_FILENAME, "wb")
+            )
+
+        try:
+            worker = partial(
+                transform_file,
+                min_text_length=min_text_length,
+                strip_tags=strip_tags,
+                source_map=source_map,
+                processed_dir=processed_dir,
+                processed_at=processed_at,
+                use_ndjson=use_ndjson,
+                config_mtime_ns=CONFIG_PATH.stat().st_mtime_ns,
+            )
+            for file_path, result, error in map_files(worker, html_files):
+                if error is not None:
+                    logger.error("Failed to process %s: %s", os.path.basename(file_path), error)
                     skipped += 1
                     continue
-                if process_file(file_path, config, source_map):
+                outcome, line = result
+                if outcome == "processed":
+                    if line is not None:
+                        ndjson_writer.write(line)
+                    processed += 1
+                elif outcome == "cached":
+                    cached_files += 1
                     processed += 1
                 else:
+                    if outcome == "empty":
+                        empty_files += 1
                     skipped += 1
-            except Exception as e:
-                logger.error("Failed to process %s: %s", file_path.name, e)
-                skipped += 1
+        finally:
+            if ndjson_writer is not None:
+                ndjson_writer.close()
 
         tracker.add_metric("empty_files", empty_files)
+        tracker.add_metric("cached_files", cached_files)
 
         logger.info("Transform complete: %d processed, %d skipped", processed, skipped)
         tracker.record(items_in=len(html_files), items_out=processed, items_skipped=skipped)
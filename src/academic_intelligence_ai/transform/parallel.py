@@ -0,0 +1,34 @@
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from academic_intelligence_ai.monitoring.logger import configure_worker_logging, worker_log_queue
+
+
+def map_files(fn: Callable, files: list) -> Iterator[tuple[object, object, Exception | None]]:
+    """Apply fn to every file, across a process pool when there is more than one.
+
+    fn must be picklable (a module-level function or a functools.partial of one).
+    files are usually path strings, but any picklable items work (e.g. NDJSON
+    records).
+    Yields (file_path, result, error) in completion order, where error is the
+    exception fn raised for that file or None.
+    """
+    if len(files) <= 1:
+        for file_path in files:
+            try:
+                yield file_path, fn(file_path), None
+            except Exception as e:
+                yield file_path, None, e
+        return
+
+    # Workers log through a queue to this process instead of opening the log file
+    with worker_log_queue() as log_queue, ProcessPoolExecutor(
+        initializer=configure_worker_logging, initargs=(log_queue,)
+    ) as ex:
+        futures = {ex.submit(fn, fp): fp for fp in files}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                yield file_path, future.result(), None
+            except Exception as e:
+                yield file_path, None, e
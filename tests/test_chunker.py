@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from academic_intelligence_ai.transform.chunker import chunk_text
+
+
+def reference_chunk_text(text: str, chunk_size: int, chunk_overlap: int, min_chunk_size: int) -> list[dict]:
+    """The original character-by-character chunking loop, pinned as the reference.
+
+    char_offset here is the raw window start; chunk_text reports the start of
+    the stripped chunk instead, so only text, index and length are compared.
+    """
+    if len(text) <= chunk_size:
+        if len(text) >= min_chunk_size:
+            return [{"chunk_index": 0, "text": text, "char_offset": 0, "chunk_length": len(text)}]
+        return []
+
+    chunks = []
+    start = 0
+
+    while start < len(text):
+        end = start + chunk_size
+
+        if end >= len(text):
+            chunk = text[start:].strip()
+            if len(chunk) >= min_chunk_size:
+                chunks.append({
+                    "chunk_index": len(chunks),
+                    "text": chunk,
+                    "char_offset": start,
+                    "chunk_length": len(chunk),
+                })
+            break
+
+        boundary = end
+        while boundary > start and text[boundary] != " ":
+            boundary -= 1
+        if boundary == start:
+            boundary = end
+
+        chunk = text[start:boundary].strip()
+        if len(chunk) >= min_chunk_size:
+            chunks.append({
+                "chunk_index": len(chunks),
+                "text": chunk,
+                "char_offset": start,
+                "chunk_length": len(chunk),
+            })
+
+        step = boundary - start - chunk_overlap
+        if step <= 0:
+            step = 1
+        start = start + step
+
+    return chunks
+
+
+def random_cases(seed: int, count: int):
+    """Yield (text, chunk_size, chunk_overlap, min_chunk_size) with awkward spacing and non-ASCII text."""
+    rng = random.Random(seed)
+    alphabets = ["ab ", "abcdefg  ", "x", "a b\n", "čćž š ", "studije upis  "]
+    for _ in range(count):
+        alphabet = rng.choice(alphabets)
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3000)))
+        chunk_size = rng.randint(1, 500)
+        yield text, chunk_size, rng.randint(0, chunk_size + 5), rng.randint(0, 60)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_chunk_text_matches_reference(seed):
+    for text, chunk_size, chunk_overlap, min_chunk_size in random_cases(seed, 1000):
+        expected = reference_chunk_text(text, chunk_size, chunk_overlap, min_chunk_size)
+        actual = list(chunk_text(text, chunk_size, chunk_overlap, min_chunk_size))
+
+        assert [(c["chunk_index"], c["text"], c["chunk_length"]) for c in actual] == [
+            (c["chunk_index"], c["text"], c["chunk_length"]) for c in expected
+        ]
+        for chunk in actual:
+            offset = chunk["char_offset"]
+            assert text[offset:offset + chunk["chunk_length"]] == chunk["text"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_offsets_only_chunks_slice_back_to_text(seed):
+    for text, chunk_size, chunk_overlap, min_chunk_size in random_cases(seed, 500):
+        with_text = list(chunk_text(text, chunk_size, chunk_overlap, min_chunk_size))
+        offsets_only = list(chunk_text(text, chunk_size, chunk_overlap, min_chunk_size, store_text=False))
+
+        assert len(offsets_only) == len(with_text)
+        for full, slim in zip(with_text, offsets_only):
+            assert "text" not in slim
+            assert slim == {k: v for k, v in full.items() if k != "text"}
+            assert text[slim["char_offset"]:slim["char_offset"] + slim["chunk_length"]] == full["text"]